@@ -0,0 +1,96 @@
+import time
+import uuid
+
+import ollama
+from swarm_ollama.util import function_to_json
+
+from main import build_agent
+
+# Fixed request corpus: each request with the tool and the arguments the model is expected to call it with.
+REQUEST_CORPUS = [
+    {
+        "content": "Today's date is Monday, 2024-11-25. Create a single event for 2 december 2024, from 17 till 18, meeting with my girlfriend.",
+        "tool": "calendar_add_event",
+        "arguments": {"date": "2024-12-02", "start_time": "17:00", "end_time": "18:00"},
+    },
+    {
+        "content": "Today's date is Monday, 2024-11-25. Create a recurring event starting from monday 25/11/2024, meeting with dog, from 17 till 18. every monday for the next 5 times.",
+        "tool": "calendar_add_recurring_event",
+        "arguments": {"start_date": "2024-11-25", "start_time": "17:00", "end_time": "18:00", "freq": "WEEKLY"},
+    },
+    {
+        "content": "Today's date is Wednesday, 2024-11-27. Add a dentist appointment tomorrow from 09:30 to 10:15.",
+        "tool": "calendar_add_event",
+        "arguments": {"date": "2024-11-28", "start_time": "09:30", "end_time": "10:15"},
+    },
+    {
+        "content": "Today's date is Friday, 2024-11-29. Schedule gym every day from 07:00 till 08:00 starting 2024-12-02 for 10 days.",
+        "tool": "calendar_add_recurring_event",
+        "arguments": {"start_date": "2024-12-02", "start_time": "07:00", "end_time": "08:00", "freq": "DAILY"},
+    },
+]
+
+
+def run_corpus(agent):
+    """
+    Sends every request in the corpus to the agent's model with its instructions and tool schemas,
+    without executing any tool.
+
+    An untimed warm-up request is sent first so model loading isn't counted. Every request starts with a
+    unique marker in the system message, so Ollama can't reuse the cached prompt prefix of the previous
+    request and each one pays the full prefill of the instructions and tool schemas.
+
+    Args:
+        agent (Agent): The agent from `build_agent`, whose model, instructions and functions are used.
+
+    Returns:
+        dict: Prompt tokens, prefill time and total latency in seconds, and the number of correct tool calls.
+    """
+    model = agent.model
+    instructions = agent.instructions
+    tools = [function_to_json(func) for func in agent.functions]
+    ollama.chat(model=model, messages=[{"role": "user", "content": "Hello"}], tools=tools)
+
+    prompt_tokens = 0
+    prefill = 0.0
+    latency = 0.0
+    correct = 0
+
+    for request in REQUEST_CORPUS:
+        messages = [
+            {"role": "system", "content": f"[{uuid.uuid4().hex}] {instructions}"},
+            {"role": "user", "content": request["content"]},
+        ]
+        start = time.perf_counter()
+        response = ollama.chat(model=model, messages=messages, tools=tools)
+        latency += time.perf_counter() - start
+        prompt_tokens += response["prompt_eval_count"]
+        prefill += response["prompt_eval_duration"] / 1e9
+
+        tool_calls = response["message"].get("tool_calls") or []
+        if tool_calls:
+            call = tool_calls[0]["function"]
+            arguments = {key: str(value) for key, value in call["arguments"].items()}
+            if call["name"] == request["tool"] and all(
+                    arguments.get(key, "").upper() == value.upper() for key, value in request["arguments"].items()):
+                correct += 1
+
+    return {"prompt_tokens": prompt_tokens, "prefill": prefill, "latency": latency, "correct": correct}
+
+
+def main():
+    full = run_corpus(build_agent(compact=False))
+    compact = run_corpus(build_agent(compact=True))
+
+    total = len(REQUEST_CORPUS)
+    for name, result in (("full", full), ("compact", compact)):
+        print(f"{name:8} prompt tokens: {result['prompt_tokens']:6}  prefill: {result['prefill']:7.2f}s  "
+              f"latency: {result['latency']:7.2f}s  "
+              f"correct tool calls: {result['correct']}/{total}")
+
+    if compact["correct"] < full["correct"]:
+        raise SystemExit("Compact tool schemas regressed tool-call accuracy.")
+
+
+if __name__ == "__main__":
+    main()
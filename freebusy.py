@@ -0,0 +1,131 @@
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+# Busy periods are cached per calendar and time window for FREEBUSY_TTL seconds.
+FREEBUSY_TTL = 60
+# Google rejects freebusy queries over long time ranges (timeRangeTooLong), so longer windows are split.
+MAX_FREEBUSY_DAYS = 60
+freebusy_cache = {}
+
+
+class FreeBusyError(Exception):
+    """Raised when Google Calendar reports an error for a calendar in a freebusy response."""
+
+
+def query_google_busy(service, time_min, time_max, calendar_id='primary'):
+    """
+    Returns the busy periods of a Google Calendar within a time window, using a short-TTL cache.
+
+    A single `freebusy().query` call covers the whole window, unless it is longer than
+    `MAX_FREEBUSY_DAYS`; then it is split into consecutive windows of at most that length. The result
+    is cached by calendar and time window, and any fresh cached window that contains the requested
+    one is reused, so repeated checks within a session don't make extra API calls.
+
+    Args:
+        service: The Google Calendar API service object.
+        time_min (datetime): Start of the window (timezone-aware).
+        time_max (datetime): End of the window (timezone-aware).
+        calendar_id (str): The calendar to query. Defaults to 'primary'.
+
+    Returns:
+        list: `(start, end)` tuples of timezone-aware datetimes for each busy period in the window.
+
+    Raises:
+        FreeBusyError: If Google reports errors for the calendar instead of busy periods.
+    """
+    now = time.monotonic()
+    for (cached_id, cached_min, cached_max), (fetched_at, busy) in list(freebusy_cache.items()):
+        if now - fetched_at > FREEBUSY_TTL:
+            del freebusy_cache[(cached_id, cached_min, cached_max)]
+        elif cached_id == calendar_id and cached_min <= time_min and time_max <= cached_max:
+            return [(start, end) for start, end in busy if start < time_max and end > time_min]
+
+    busy = []
+    window_start = time_min
+    while window_start < time_max:
+        window_end = min(window_start + timedelta(days=MAX_FREEBUSY_DAYS), time_max)
+        body = {
+            'timeMin': window_start.isoformat(),
+            'timeMax': window_end.isoformat(),
+            'timeZone': 'Europe/Brussels',
+            'items': [{'id': calendar_id}],
+        }
+        response = service.freebusy().query(body=body).execute()
+        calendar = response['calendars'][calendar_id]
+        if calendar.get('errors'):
+            reasons = ', '.join(error.get('reason', 'unknown') for error in calendar['errors'])
+            raise FreeBusyError(f"Google Calendar reported errors for calendar '{calendar_id}': {reasons}")
+
+        busy += [
+            (datetime.fromisoformat(period['start'].replace('Z', '+00:00')),
+             datetime.fromisoformat(period['end'].replace('Z', '+00:00')))
+            for period in calendar.get('busy', [])
+        ]
+        window_start = window_end
+
+    freebusy_cache[(calendar_id, time_min, time_max)] = (now, busy)
+    return busy
+
+
+def find_busy_overlaps(service, dates, start_time, end_time, calendar_id='primary'):
+    """
+    Finds the dates on which an event would overlap with busy time in Google Calendar.
+
+    All dates, e.g. every occurrence of a recurring event, are checked with one freebusy lookup
+    spanning the first to the last date.
+
+    Args:
+        service: The Google Calendar API service object.
+        dates (list): The event dates in `YYYY-MM-DD` format.
+        start_time (str): The start time of the event in `HH:MM` format (24-hour clock).
+        end_time (str): The end time of the event in `HH:MM` format (24-hour clock).
+        calendar_id (str): The calendar to check. Defaults to 'primary'.
+
+    Returns:
+        list: `(date, busy_start, busy_end)` tuples with the first overlapping busy period of each
+              conflicting date, in the order of `dates`.
+
+    Raises:
+        FreeBusyError: If Google reports errors for the calendar instead of busy periods.
+    """
+    if not dates:
+        return []
+
+    timezone = ZoneInfo('Europe/Brussels')
+    days = sorted(datetime.strptime(date, '%Y-%m-%d').replace(tzinfo=timezone) for date in dates)
+    busy = query_google_busy(service, days[0], days[-1] + timedelta(days=1), calendar_id)
+
+    overlaps = []
+    for date in dates:
+        start_datetime = datetime.strptime(f"{date}T{start_time}:00", "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone)
+        end_datetime = datetime.strptime(f"{date}T{end_time}:00", "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone)
+        for busy_start, busy_end in busy:
+            if start_datetime < busy_end and end_datetime > busy_start:
+                overlaps.append((date, busy_start.astimezone(timezone), busy_end.astimezone(timezone)))
+                break
+
+    return overlaps
+
+
+def check_google_busy_conflict(service, dates, start_time, end_time, calendar_id='primary'):
+    """
+    Checks if an event on the given dates overlaps with busy time in Google Calendar.
+
+    Args:
+        service: The Google Calendar API service object.
+        dates (list): The event dates in `YYYY-MM-DD` format.
+        start_time (str): The start time of the event in `HH:MM` format (24-hour clock).
+        end_time (str): The end time of the event in `HH:MM` format (24-hour clock).
+        calendar_id (str): The calendar to check. Defaults to 'primary'.
+
+    Returns:
+        str: A conflict message, or None if the time slot is free on every date.
+
+    Raises:
+        FreeBusyError: If Google reports errors for the calendar instead of busy periods.
+    """
+    overlaps = find_busy_overlaps(service, dates, start_time, end_time, calendar_id)
+    if overlaps:
+        date, busy_start, busy_end = overlaps[0]
+        return f"Your new event on {date} overlaps with busy time in Google Calendar from {busy_start.strftime('%Y-%m-%d %H:%M')} to {busy_end.strftime('%Y-%m-%d %H:%M')}. Please reschedule this new event another time."
@@ -1,16 +1,28 @@
+import calendar
+import functools
+import inspect
 import json
+import mmap
 import os
 import re
+import struct
+import time
+import zlib
 from datetime import datetime, timedelta
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from swarm_ollama import Swarm, Agent
+from swarm_ollama.util import function_to_json
 
 import ollama
 
+from freebusy import FreeBusyError, check_google_busy_conflict, find_busy_overlaps
+from recurrence import expand_recurrence
+
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
 scheduling_assistant = """
@@ -21,7 +33,24 @@ PARAMETER temperature 0.1
 SYSTEM You are a scheduling helper. You are super smart. Only respond with natural language. Don't give python code. If there's a scheduling conflict please give me the date of the conflicting event and why it's conflicting. Be precise. If a event is created please summarize the event in a bullet point list. Don't talk about tool responses!
 """
 
-ollama.create(model='scheduling_assistant', modelfile=scheduling_assistant)
+# Set CALENDRRR_COMPACT_TOOLS=1 to send terse tool descriptions and shorter agent instructions,
+# which cuts prompt prefill on CPU-only hosts. The full docstrings stay in the code for humans.
+COMPACT_TOOL_SCHEMAS = os.environ.get('CALENDRRR_COMPACT_TOOLS', '0') == '1'
+
+# Binary snapshot of the local calendar, kept next to the JSON file and regenerated whenever it changes.
+# Set CALENDRRR_SNAPSHOT=0 to always read the JSON file instead.
+USE_CALENDAR_SNAPSHOT = os.environ.get('CALENDRRR_SNAPSHOT', '1') == '1'
+SNAPSHOT_MAGIC = b'CALSNAP2'
+SNAPSHOT_HEADER = struct.Struct('<8sqqIII')  # magic, JSON mtime (ns), JSON size, event count, titles size, CRC32
+SNAPSHOT_RECORD = struct.Struct('<qqII')  # start epoch, end epoch, title offset, title length
+EPOCH = datetime(1970, 1, 1)
+verified_snapshots = set()  # (path, mtime, size) of snapshot files whose CRC32 has been checked.
+
+# Set CALENDRRR_GOOGLE_BUSY=1 to check Google-side busy time with a freebusy query before inserting events.
+CHECK_GOOGLE_BUSY = os.environ.get('CALENDRRR_GOOGLE_BUSY', '0') == '1'
+
+# Set CALENDRRR_STREAM=1 to print assistant tokens as they arrive and run tool calls as soon as they are parsed.
+STREAM_RESPONSES = os.environ.get('CALENDRRR_STREAM', '0') == '1'
 
 
 def authenticate_google_account():    
@@ -83,11 +112,171 @@ def create_recurrence_rule(freq, interval=1, count=None, until=None, byday=None)
     return rule
 
 
+def snapshot_path_for(file_path):
+    """
+    Returns the path of the binary snapshot stored next to a local calendar JSON file.
+
+    Args:
+        file_path (str): The path to the local JSON file storing calendar events.
+
+    Returns:
+        str: The snapshot path, e.g. `database/database.snapshot` for `database/database.json`.
+    """
+    return os.path.splitext(file_path)[0] + '.snapshot'
+
+
+def write_calendar_snapshot(data, file_path='database/database.json'):
+    """
+    Writes a binary snapshot of the calendar next to the local JSON file.
+
+    The snapshot starts with a header holding the JSON file's modification time and size, so readers
+    can tell when it is stale, and the event count, string table size and CRC32 of the rest of the file,
+    so they can tell when it is damaged. It is followed by fixed-width event records sorted by start time
+    (start epoch, end epoch, title offset, title length) and a UTF-8 string table with the titles.
+    Readers can `mmap` it and binary-search the records without deserialising the JSON.
+
+    Args:
+        data (dict): The calendar data, as stored in the JSON file.
+        file_path (str): The path to the local JSON file the snapshot belongs to.
+    """
+    events = []
+    for day in data.get('calendar', []):
+        for event in day['events']:
+            event_start = datetime.strptime(event['start']['dateTime'], "%Y-%m-%dT%H:%M:%S")
+            event_end = datetime.strptime(event['end']['dateTime'], "%Y-%m-%dT%H:%M:%S")
+            events.append((calendar.timegm(event_start.timetuple()), calendar.timegm(event_end.timetuple()),
+                           event['summary'].encode('utf-8')))
+    events.sort(key=lambda event: event[0])
+
+    stat = os.stat(file_path)
+    records = bytearray()
+    titles = bytearray()
+    for event_start, event_end, title in events:
+        records += SNAPSHOT_RECORD.pack(event_start, event_end, len(titles), len(title))
+        titles += title
+
+    checksum = zlib.crc32(titles, zlib.crc32(records))
+    snapshot_path = snapshot_path_for(file_path)
+    with open(snapshot_path + '.tmp', 'wb') as file:
+        file.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, stat.st_mtime_ns, stat.st_size, len(events), len(titles),
+                                        checksum))
+        file.write(records)
+        file.write(titles)
+    os.replace(snapshot_path + '.tmp', snapshot_path)
+
+
+def read_snapshot_events(date, file_path='database/database.json'):
+    """
+    Reads the events starting on the given date from the binary calendar snapshot.
+
+    The snapshot is memory-mapped and binary-searched on start time. If it is missing, older than
+    the JSON file, or truncated or damaged, it is regenerated first. Its CRC32 is only verified the
+    first time a snapshot file is read, so later reads don't touch the whole file.
+
+    Args:
+        date (str): The date in `YYYY-MM-DD` format.
+        file_path (str): The path to the local JSON file storing calendar events.
+
+    Returns:
+        list: `(summary, start, end)` tuples sorted by start time, or None if no snapshot is available
+              (snapshots disabled or the JSON file can't be parsed).
+    """
+    if not USE_CALENDAR_SNAPSHOT:
+        return None
+
+    snapshot_path = snapshot_path_for(file_path)
+    stat = os.stat(file_path)
+    for _ in range(2):
+        if os.path.exists(snapshot_path) and os.path.getsize(snapshot_path) >= SNAPSHOT_HEADER.size:
+            with open(snapshot_path, 'rb') as file:
+                snapshot_stat = os.fstat(file.fileno())
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as snapshot:
+                    magic, mtime_ns, size, count, titles_size, checksum = SNAPSHOT_HEADER.unpack_from(snapshot, 0)
+                    version = (snapshot_path, snapshot_stat.st_mtime_ns, snapshot_stat.st_size)
+                    if (magic == SNAPSHOT_MAGIC and mtime_ns == stat.st_mtime_ns and size == stat.st_size
+                            and snapshot_stat.st_size == SNAPSHOT_HEADER.size + count * SNAPSHOT_RECORD.size + titles_size
+                            and (version in verified_snapshots or snapshot_checksum(snapshot) == checksum)):
+                        verified_snapshots.add(version)
+                        try:
+                            return search_snapshot(snapshot, count, date)
+                        except (struct.error, ValueError):
+                            pass  # Damaged snapshot, regenerate it below.
+
+        with open(file_path, 'r') as file:
+            try:
+                data = json.load(file)
+            except json.JSONDecodeError:
+                return None
+        write_calendar_snapshot(data, file_path)
+
+    return None
+
+
+def snapshot_checksum(snapshot):
+    """
+    Computes the CRC32 of everything after the snapshot header.
+
+    Args:
+        snapshot (mmap.mmap): The memory-mapped snapshot.
+
+    Returns:
+        int: The CRC32 of the records and string table.
+    """
+    with memoryview(snapshot)[SNAPSHOT_HEADER.size:] as body:
+        return zlib.crc32(body)
+
+
+def search_snapshot(snapshot, count, date):
+    """
+    Binary-searches the snapshot records for events starting on the given date.
+
+    Args:
+        snapshot (mmap.mmap): The memory-mapped snapshot.
+        count (int): The number of event records in the snapshot.
+        date (str): The date in `YYYY-MM-DD` format.
+
+    Returns:
+        list: `(summary, start, end)` tuples sorted by start time.
+
+    Raises:
+        struct.error: If the records are truncated.
+        ValueError: If a title is truncated or not valid UTF-8.
+    """
+    day_start = calendar.timegm(datetime.strptime(date, '%Y-%m-%d').timetuple())
+    day_end = day_start + 24 * 60 * 60
+    titles_offset = SNAPSHOT_HEADER.size + count * SNAPSHOT_RECORD.size
+
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        event_start, _, _, _ = SNAPSHOT_RECORD.unpack_from(snapshot, SNAPSHOT_HEADER.size + middle * SNAPSHOT_RECORD.size)
+        if event_start < day_start:
+            low = middle + 1
+        else:
+            high = middle
+
+    events = []
+    for index in range(low, count):
+        event_start, event_end, title_offset, title_length = SNAPSHOT_RECORD.unpack_from(
+            snapshot, SNAPSHOT_HEADER.size + index * SNAPSHOT_RECORD.size)
+        if event_start >= day_end:
+            break
+        title = snapshot[titles_offset + title_offset:titles_offset + title_offset + title_length]
+        if len(title) != title_length:
+            raise ValueError("Truncated calendar snapshot.")
+        title = title.decode('utf-8')
+        events.append((title, EPOCH + timedelta(seconds=event_start), EPOCH + timedelta(seconds=event_end)))
+
+    return events
+
+
 def check_single_event_conflict(date, start_time, end_time, file_path='database/database.json'):
     """
     Checks if there's an existing event on the specified date and if there is a time conflict with
     any existing events, including checking for a minimum 30-minute gap between events.
 
+    The binary calendar snapshot is used when available, so the JSON file doesn't have to be parsed.
+
     Args:
         date (str): The date of the event in `YYYY-MM-DD` format.
         start_time (str): The start time of the event in `HH:MM` format (24-hour clock).
@@ -100,35 +289,41 @@ def check_single_event_conflict(date, start_time, end_time, file_path='database/
     if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
         return None
 
-    with open(file_path, 'r') as file:
-        try:
-            data = json.load(file)
-        except json.JSONDecodeError:
-            return "Error: Failed to parse the calendar data."
+    events = read_snapshot_events(date, file_path)
+    if events is None:
+        with open(file_path, 'r') as file:
+            try:
+                data = json.load(file)
+            except json.JSONDecodeError:
+                return "Error: Failed to parse the calendar data."
+
+        events = []
+        for day in data.get('calendar', []):
+            if day['date'] == date:
+                for event in day['events']:
+                    event_start = datetime.strptime(event['start']['dateTime'], "%Y-%m-%dT%H:%M:%S")
+                    event_end = datetime.strptime(event['end']['dateTime'], "%Y-%m-%dT%H:%M:%S")
+                    events.append((event['summary'], event_start, event_end))
+        events.sort(key=lambda event: event[1])  # Same order as the snapshot.
 
     start_datetime = datetime.strptime(f"{date}T{start_time}:00", "%Y-%m-%dT%H:%M:%S")
     end_datetime = datetime.strptime(f"{date}T{end_time}:00", "%Y-%m-%dT%H:%M:%S")
     min_gap = timedelta(minutes=30)
 
-    for day in data.get('calendar', []):
-        if day['date'] == date:
-            for event in day['events']:
-                event_start = datetime.strptime(event['start']['dateTime'], "%Y-%m-%dT%H:%M:%S")
-                event_end = datetime.strptime(event['end']['dateTime'], "%Y-%m-%dT%H:%M:%S")
-
-                if start_datetime < event_end and end_datetime > event_start:
-                    if start_datetime <= event_start and end_datetime >= event_end:
-                        return f"Your new event completely overlaps with the event '{event['summary']}' from {event_start} to {event_end}. Please reschedule this new event another time."
-                    elif start_datetime < event_start < end_datetime <= event_end:
-                        return f"Your new event partially overlaps with the event '{event['summary']}' that starts at {event_start}. Please reschedule this new event another time."
-                    elif event_start <= start_datetime < event_end < end_datetime:
-                        return f"Your new event partially overlaps with the event '{event['summary']}' that ends at {event_end}. Please reschedule this new event another time."
-                    elif start_datetime >= event_start and end_datetime <= event_end:
-                        return f"Your new event is contained within the event '{event['summary']}' from {event_start} to {event_end}. Please reschedule this new event another time."
-                elif event_end + min_gap > start_datetime:
-                    return f"Your new event is too close to the event '{event['summary']}' that starts at {event_start} and ends at {event_end}. Please ensure at least a 30-minute gap between events."
-                elif end_datetime + min_gap > event_start:
-                    return f"Your new event ends too close to the event '{event['summary']}' that starts at {event_start} and ends at {event_end}. Please ensure at least a 30-minute gap between events."
+    for summary, event_start, event_end in events:
+        if start_datetime < event_end and end_datetime > event_start:
+            if start_datetime <= event_start and end_datetime >= event_end:
+                return f"Your new event completely overlaps with the event '{summary}' from {event_start} to {event_end}. Please reschedule this new event another time."
+            elif start_datetime < event_start < end_datetime <= event_end:
+                return f"Your new event partially overlaps with the event '{summary}' that starts at {event_start}. Please reschedule this new event another time."
+            elif event_start <= start_datetime < event_end < end_datetime:
+                return f"Your new event partially overlaps with the event '{summary}' that ends at {event_end}. Please reschedule this new event another time."
+            elif start_datetime >= event_start and end_datetime <= event_end:
+                return f"Your new event is contained within the event '{summary}' from {event_start} to {event_end}. Please reschedule this new event another time."
+        elif event_end + min_gap > start_datetime:
+            return f"Your new event is too close to the event '{summary}' that starts at {event_start} and ends at {event_end}. Please ensure at least a 30-minute gap between events."
+        elif end_datetime + min_gap > event_start:
+            return f"Your new event ends too close to the event '{summary}' that starts at {event_start} and ends at {event_end}. Please ensure at least a 30-minute gap between events."
 
 
 def check_recurring_event_conflicts(start_date, start_time, end_time, recurrence_rule, file_path='database/database.json'):
@@ -145,26 +340,7 @@ def check_recurring_event_conflicts(start_date, start_time, end_time, recurrence
     Returns:
         str: Conflict message, or None if no conflicts exist.
     """
-    recurrence_details = re.findall(r"(FREQ|INTERVAL|UNTIL|COUNT|BYDAY)=([^;]+)", recurrence_rule)
-    recurrence_params = {key: value for key, value in recurrence_details}
-
-    occurrences = []
-    current_date = datetime.strptime(start_date, '%Y-%m-%d')
-    interval = int(recurrence_params.get('INTERVAL', 1))
-    freq = recurrence_params['FREQ']
-    count = int(recurrence_params.get('COUNT', 0)) if 'COUNT' in recurrence_params else None
-    until = datetime.strptime(recurrence_params['UNTIL'], '%Y%m%d') if 'UNTIL' in recurrence_params else None
-
-    while (not until or current_date <= until) and (not count or len(occurrences) < count):
-        occurrences.append(current_date.strftime('%Y-%m-%d'))
-        if freq == 'DAILY':
-            current_date += timedelta(days=interval)
-        elif freq == 'WEEKLY':
-            current_date += timedelta(weeks=interval)
-        elif freq == 'MONTHLY':
-            current_date += timedelta(days=30 * interval)
-        elif freq == 'YEARLY':
-            current_date += timedelta(days=365 * interval)
+    occurrences = expand_recurrence(start_date, recurrence_rule)
 
     for date in occurrences:
         conflict_message = check_single_event_conflict(date, start_time, end_time, file_path)
@@ -172,7 +348,7 @@ def check_recurring_event_conflicts(start_date, start_time, end_time, recurrence
             return conflict_message
 
 
-def suggest_free_dates(start_time, end_time, file_path='database/database.json'):
+def suggest_free_dates(start_time, end_time, file_path='database/database.json', service=None):
     """
     Suggests dates within the next two weeks when the given event time slot is free.
 
@@ -180,6 +356,8 @@ def suggest_free_dates(start_time, end_time, file_path='database/database.json')
         start_time (str): Desired start time in 'HH:MM' format.
         end_time (str): Desired end time in 'HH:MM' format.
         file_path (str): Path to the local calendar JSON file.
+        service (optional): A Google Calendar API service object. If given, dates that are busy in
+                            Google Calendar are left out too, using a single freebusy lookup.
 
     Returns:
         list: A list of free dates (in 'YYYY-MM-DD' format) for the given time slot.
@@ -194,6 +372,13 @@ def suggest_free_dates(start_time, end_time, file_path='database/database.json')
         if not conflict_message:
             free_dates.append(current_date)
 
+    if service and free_dates:
+        try:
+            busy_dates = {date for date, _, _ in find_busy_overlaps(service, free_dates, start_time, end_time)}
+        except (HttpError, FreeBusyError):
+            busy_dates = set()  # Fall back to the local calendar only.
+        free_dates = [date for date in free_dates if date not in busy_dates]
+
     return free_dates
 
 
@@ -217,6 +402,22 @@ def add_single_event_local(date, title, start_time, end_time, file_path='databas
     if conflict_message:
         return conflict_message
 
+    write_local_events([date], title, start_time, end_time, file_path)
+
+
+def write_local_events(dates, title, start_time, end_time, file_path='database/database.json'):
+    """
+    Appends an event on each of the given dates to the local JSON calendar, without checking for conflicts.
+
+    The JSON file and the binary snapshot are written once for all dates.
+
+    Args:
+        dates (list): The event dates in `YYYY-MM-DD` format.
+        title (str): The title or summary of the event.
+        start_time (str): The start time of the event in `HH:MM` format (24-hour clock).
+        end_time (str): The end time of the event in `HH:MM` format (24-hour clock).
+        file_path (str): The path to the local JSON file storing calendar events.
+    """
     if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
         data = {"calendar": []}
     else:
@@ -226,36 +427,42 @@ def add_single_event_local(date, title, start_time, end_time, file_path='databas
             except json.JSONDecodeError:
                 data = {"calendar": []}
 
-    start_datetime = f"{date}T{start_time}:00"
-    end_datetime = f"{date}T{end_time}:00"
-    event = {
-        'summary': title,
-        'start': {'dateTime': start_datetime, 'timeZone': 'Europe/Brussels'},
-        'end': {'dateTime': end_datetime, 'timeZone': 'Europe/Brussels'},
-    }
-
-    date_exists = False
-    for day in data['calendar']:
-        if day['date'] == date:
-            day['events'].append(event)
-            date_exists = True
-            break
-
-    if not date_exists:
-        new_day = {
-            "date": date,
-            "events": [event]
+    for date in dates:
+        start_datetime = f"{date}T{start_time}:00"
+        end_datetime = f"{date}T{end_time}:00"
+        event = {
+            'summary': title,
+            'start': {'dateTime': start_datetime, 'timeZone': 'Europe/Brussels'},
+            'end': {'dateTime': end_datetime, 'timeZone': 'Europe/Brussels'},
         }
-        data['calendar'].append(new_day)
+
+        date_exists = False
+        for day in data['calendar']:
+            if day['date'] == date:
+                day['events'].append(event)
+                date_exists = True
+                break
+
+        if not date_exists:
+            new_day = {
+                "date": date,
+                "events": [event]
+            }
+            data['calendar'].append(new_day)
 
     with open(file_path, 'w') as file:
         json.dump(data, file, indent=4)
 
+    if USE_CALENDAR_SNAPSHOT:
+        write_calendar_snapshot(data, file_path)
+
 
 def add_recurring_event_local(start_date, title, start_time, end_time, recurrence_rule, file_path='database/database.json'):
     """
     Adds a recurring event to the local calendar.
 
+    All occurrences are checked for conflicts first, then written in one go.
+
     Args:
         start_date (str): Start date of recurrence (YYYY-MM-DD).
         title (str): Title of the event.
@@ -267,33 +474,14 @@ def add_recurring_event_local(start_date, title, start_time, end_time, recurrenc
     Returns:
         str: Success or conflict message.
     """
-    recurrence_details = re.findall(r"(FREQ|INTERVAL|UNTIL|COUNT|BYDAY)=([^;]+)", recurrence_rule)
-    recurrence_params = {key: value for key, value in recurrence_details}
-
-    occurrences = []
-    current_date = datetime.strptime(start_date, '%Y-%m-%d')
-    interval = int(recurrence_params.get('INTERVAL', 1))
-    freq = recurrence_params['FREQ']
-    count = int(recurrence_params.get('COUNT', 0)) if 'COUNT' in recurrence_params else None
-    until = datetime.strptime(recurrence_params['UNTIL'], '%Y%m%d') if 'UNTIL' in recurrence_params else None
-
-    while (not until or current_date <= until) and (not count or len(occurrences) < count):
-        occurrences.append(current_date.strftime('%Y-%m-%d'))
-        if freq == 'DAILY':
-            current_date += timedelta(days=interval)
-        elif freq == 'WEEKLY':
-            current_date += timedelta(weeks=interval)
-        elif freq == 'MONTHLY':
-            current_date += timedelta(days=30 * interval)
-        elif freq == 'YEARLY':
-            current_date += timedelta(days=365 * interval)
+    occurrences = expand_recurrence(start_date, recurrence_rule)
 
     for date in occurrences:
         conflict_message = check_single_event_conflict(date, start_time, end_time, file_path)
         if conflict_message:
             return conflict_message
 
-        add_single_event_local(date, title, start_time, end_time, file_path)
+    write_local_events(occurrences, title, start_time, end_time, file_path)
 
 
 def add_single_google_event(service, date, title, start_time, end_time):
@@ -391,15 +579,26 @@ def calendar_add_event(date: str, title: str, start_time: str, end_time: str) ->
             If the input parameters are invalid, such as incorrect date or time formats,
             or if the end time is earlier than the start time.
     """
-    conflict_message = add_single_event_local(date, title, start_time, end_time)
+    # Only log in to Google up front when the busy check needs it.
+    service = authenticate_google_account() if CHECK_GOOGLE_BUSY else None
+
+    conflict_message = None
+    if CHECK_GOOGLE_BUSY:
+        try:
+            conflict_message = check_google_busy_conflict(service, [date], start_time, end_time)
+        except (HttpError, FreeBusyError) as error:
+            return f"The event was not added because the Google Calendar conflict check could not run: {error}"
+
+    if not conflict_message:
+        conflict_message = add_single_event_local(date, title, start_time, end_time)
     if conflict_message:
-        free_dates = suggest_free_dates(start_time, end_time)
+        free_dates = suggest_free_dates(start_time, end_time, service=service)
         if free_dates:
             return f"Conflict detected: {conflict_message}\nSuggested free dates for this time slot: {', '.join(free_dates)}"
         else:
             return f"Conflict detected: {conflict_message}\nNo free dates available for the specified time slot within the next two weeks."
 
-    service = authenticate_google_account()
+    service = service or authenticate_google_account()
     add_single_google_event(service, date, title, start_time, end_time)
 
     return "Event added successfully."
@@ -470,48 +669,215 @@ def calendar_add_recurring_event(
     """
     recurrence_rule = create_recurrence_rule(freq, interval, count, until, byday)
 
+    # Only log in to Google up front when the busy check needs it.
+    service = authenticate_google_account() if CHECK_GOOGLE_BUSY else None
+
     conflict_message = check_recurring_event_conflicts(start_date, start_time, end_time, recurrence_rule)
+    if not conflict_message and CHECK_GOOGLE_BUSY:
+        occurrences = expand_recurrence(start_date, recurrence_rule)
+        try:
+            conflict_message = check_google_busy_conflict(service, occurrences, start_time, end_time)
+        except (HttpError, FreeBusyError) as error:
+            return f"The recurring event was not added because the Google Calendar conflict check could not run: {error}"
+
     if conflict_message:
-        free_dates = suggest_free_dates(start_time, end_time)
+        free_dates = suggest_free_dates(start_time, end_time, service=service)
         if free_dates:
             return f"Conflict detected for recurring event: {conflict_message}\nSuggested free dates for single occurrences within the next two weeks: {', '.join(free_dates)}"
         else:
             return f"Conflict detected for recurring event: {conflict_message}\nNo free dates available for single occurrences within the next two weeks."
 
     add_recurring_event_local(start_date, title, start_time, end_time, recurrence_rule)
-    service = authenticate_google_account()
-
+    service = service or authenticate_google_account()
     add_recurring_google_event(service, start_date, title, start_time, end_time, recurrence_rule)
     return "Recurring event added successfully."
 
 
-def main():
-    authenticate_google_account()  # this doesn't need to be here, but just in case.
+def compact_description(func):
+    """
+    Generates a terse tool description from a function's docstring.
 
-    # LLM setup
-    client = Swarm(base_url="http://localhost:11434")
-    agent_a = Agent(
+    Keeps the first sentence of the summary and the first sentence of each argument's description
+    from the `Args:` section, so the schema sent to the model stays short.
+
+    Args:
+        func (callable): The function whose docstring is summarized.
+
+    Returns:
+        str: The compact description.
+    """
+    doc = inspect.getdoc(func) or ""
+    summary = doc.split("\n\n")[0].replace("\n", " ").split(". ")[0].rstrip(".")
+
+    args = []
+    args_section = re.search(r"^Args:\n(.*?)(?:\n\n|\Z)", doc, re.MULTILINE | re.DOTALL)
+    if args_section:
+        lines = args_section.group(1).splitlines()
+        for i, line in enumerate(lines):
+            match = re.match(r"^\s{4}(\w+) \(([^)]*)\):\s*(.*)$", line)
+            if not match:
+                continue
+            name, _, description = match.groups()
+            if not description and i + 1 < len(lines):
+                description = lines[i + 1].strip()
+            description = description.split(". ")[0].rstrip(".")
+            description = re.sub(r"^The ", "", description)
+            args.append(f"{name}: {description}")
+
+    if args:
+        return f"{summary}. Args: " + "; ".join(args) + "."
+    return f"{summary}."
+
+
+def compact_tool(func):
+    """
+    Wraps a tool function so its schema uses the compact description instead of the full docstring.
+
+    Args:
+        func (callable): The tool function to wrap.
+
+    Returns:
+        callable: A wrapper with the same name and signature as `func` and a terse `__doc__`.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    wrapper.__doc__ = compact_description(func)
+    return wrapper
+
+
+def build_agent(compact=COMPACT_TOOL_SCHEMAS):
+    """
+    Creates the `scheduling_assistant` model and the scheduling agent that uses it.
+
+    Swarm sends the agent's instructions as the system message, which replaces the modelfile's
+    SYSTEM prompt, so compact mode shortens the instructions and the tool descriptions.
+
+    Args:
+        compact (bool): Send terse tool descriptions and shorter instructions. Defaults to
+                        the `CALENDRRR_COMPACT_TOOLS` environment setting.
+
+    Returns:
+        Agent: The scheduling agent.
+    """
+    ollama.create(model='scheduling_assistant', modelfile=scheduling_assistant)
+
+    functions = [calendar_add_event, calendar_add_recurring_event]
+    if compact:
+        return Agent(
+            name="Scheduler",
+            model="scheduling_assistant",
+            instructions="Scheduling assistant. Reply in natural language.",
+            functions=[compact_tool(func) for func in functions],
+        )
+
+    return Agent(
         name="Scheduler",
         model="scheduling_assistant",
         instructions="You are a helpful scheduling assistant, reply with natural language, you are very smart!",
-        functions=[calendar_add_event, calendar_add_recurring_event],
+        functions=functions,
     )
 
+
+def run_streaming(agent, messages, context_variables=None, max_turns=10, client=None,
+                  base_url="http://localhost:11434"):
+    """
+    Runs the agent like `Swarm.run`, but streams the reply and dispatches tool calls early.
+
+    Assistant tokens are printed as soon as they arrive. Each tool call is executed as soon as it
+    appears fully parsed in the stream, instead of after the whole reply has been generated. The
+    tool results are then sent back to the model until it answers without calling a tool, or until
+    `max_turns` replies have been generated. A tool that raises is reported back to the model as an
+    error message instead of ending the session.
+
+    Args:
+        agent (Agent): The agent whose model, instructions and functions are used.
+        messages (list): The conversation so far, as chat message dicts.
+        context_variables (dict, optional): Passed to callable agent instructions, as Swarm does.
+        max_turns (int): The maximum number of replies to generate. Defaults to 10.
+        client (ollama.Client, optional): The Ollama client. Defaults to a client for `base_url`.
+        base_url (str): The Ollama server URL.
+
+    Returns:
+        tuple: The full message history, the time to the first token in seconds (None if the model
+               produced no text), and the total latency in seconds.
+    """
+    client = client or ollama.Client(host=base_url)
+    functions = {func.__name__: func for func in agent.functions}
+    tools = [function_to_json(func) for func in agent.functions]
+    context_variables = context_variables or {}
+    instructions = agent.instructions(context_variables) if callable(agent.instructions) else agent.instructions
+    history = [{"role": "system", "content": instructions}] + list(messages)
+
+    start = time.perf_counter()
+    first_token = None
+    for _ in range(max_turns):
+        content = ""
+        tool_calls = []
+        tool_results = []
+        for chunk in client.chat(model=agent.model, messages=history, tools=tools, stream=True):
+            message = chunk["message"]
+            if message.get("content"):
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                print(message["content"], end="", flush=True)
+                content += message["content"]
+
+            for tool_call in message.get("tool_calls") or []:
+                name = tool_call["function"]["name"]
+                if name in functions:
+                    try:
+                        result = str(functions[name](**tool_call["function"]["arguments"]))
+                    except Exception as error:
+                        result = f"Error: Tool {name} failed: {type(error).__name__}: {error}"
+                else:
+                    result = f"Error: Tool {name} not found."
+                tool_calls.append(tool_call)
+                tool_results.append({"role": "tool", "tool_name": name, "content": result})
+
+        history.append({"role": "assistant", "content": content, "tool_calls": tool_calls})
+        history.extend(tool_results)
+        if not tool_calls:
+            break
+
+    print()
+    return history, first_token, time.perf_counter() - start
+
+
+def main():
+    authenticate_google_account()  # this doesn't need to be here, but just in case.
+
+    # LLM setup
+    agent_a = build_agent()
+
     # Example usage
     current_date = datetime.now().strftime("%Y-%m-%d")
     current_weekday = datetime.now().strftime("%A")  # Get the weekday name
     request_event = input("( 0 o 0) {Give an event date, start and end time.] (press enter to confirm input): ")
+    messages = [
+        {
+            "role": "user",
+            "content": f"Today's date is {current_weekday}, {current_date}. {request_event}"
+        }
+    ]
+
+    if STREAM_RESPONSES:
+        _, first_token, total = run_streaming(agent_a, messages)
+        first_token = f"{first_token:.2f}s" if first_token is not None else "n/a"
+        print(f"(time to first token: {first_token}, total: {total:.2f}s)")
+        return
+
+    client = Swarm(base_url="http://localhost:11434")
+    start = time.perf_counter()
     response = client.run(
         agent=agent_a,
-        messages=[
-            {
-                "role": "user",
-                "content": f"Today's date is {current_weekday}, {current_date}. {request_event}"
-            }
-        ],
+        messages=messages,
     )
+    total = time.perf_counter() - start
 
     print(response.messages[-1]["content"])
+    print(f"(total: {total:.2f}s)")
 
 
 if __name__ == "__main__":
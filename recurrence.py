@@ -0,0 +1,67 @@
+import re
+from datetime import datetime, timedelta
+
+WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+
+
+def expand_recurrence(start_date, recurrence_rule):
+    """
+    Lists the dates on which a recurring event occurs, the way Google Calendar expands the RRULE.
+
+    Supports the rules `create_recurrence_rule` builds: FREQ (DAILY, WEEKLY, MONTHLY or YEARLY),
+    INTERVAL, COUNT or UNTIL, and BYDAY with two-letter day abbreviations. Without BYDAY, a weekly
+    event repeats on the start date's weekday, a monthly event on the start date's day of the month
+    (skipping months that don't have it) and a yearly event on the start date's month and day. With
+    BYDAY, every matching weekday in an active day, week, month or year is an occurrence. The start
+    date is always the first occurrence.
+
+    Args:
+        start_date (str): Start date of the recurrence (YYYY-MM-DD).
+        recurrence_rule (str): RRULE string for the recurrence.
+
+    Returns:
+        list: The occurrence dates in 'YYYY-MM-DD' format.
+    """
+    recurrence_details = re.findall(r"(FREQ|INTERVAL|UNTIL|COUNT|BYDAY)=([^;]+)", recurrence_rule)
+    recurrence_params = {key: value for key, value in recurrence_details}
+
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    interval = int(recurrence_params.get('INTERVAL', 1))
+    freq = recurrence_params['FREQ']
+    count = int(recurrence_params.get('COUNT', 0)) if 'COUNT' in recurrence_params else None
+    until = datetime.strptime(recurrence_params['UNTIL'], '%Y%m%d') if 'UNTIL' in recurrence_params else None
+    byday = recurrence_params['BYDAY'].split(',') if 'BYDAY' in recurrence_params else None
+
+    def period(day):
+        if freq == 'DAILY':
+            return (day - start).days
+        elif freq == 'WEEKLY':
+            return ((day - timedelta(days=day.weekday())) - (start - timedelta(days=start.weekday()))).days // 7
+        elif freq == 'MONTHLY':
+            return (day.year - start.year) * 12 + day.month - start.month
+        elif freq == 'YEARLY':
+            return day.year - start.year
+        raise ValueError(f"Unsupported recurrence frequency: {freq}")
+
+    def matches(day):
+        if byday:
+            return WEEKDAYS[day.weekday()] in byday
+        elif freq == 'WEEKLY':
+            return day.weekday() == start.weekday()
+        elif freq == 'MONTHLY':
+            return day.day == start.day
+        elif freq == 'YEARLY':
+            return (day.month, day.day) == (start.month, start.day)
+        return True
+
+    if until and start > until:
+        return []
+
+    occurrences = [start.strftime('%Y-%m-%d')]
+    current_date = start + timedelta(days=1)
+    while (not until or current_date <= until) and (not count or len(occurrences) < count):
+        if period(current_date) % interval == 0 and matches(current_date):
+            occurrences.append(current_date.strftime('%Y-%m-%d'))
+        current_date += timedelta(days=1)
+
+    return occurrences
@@ -0,0 +1,80 @@
+import pytest
+
+import freebusy
+from freebusy import FreeBusyError, check_google_busy_conflict
+from recurrence import expand_recurrence
+
+
+class FakeCalendarService:
+    """Stands in for the Google Calendar service: `service.freebusy().query(body=...).execute()`."""
+
+    def __init__(self, busy=None, errors=None):
+        self.busy = busy or []
+        self.errors = errors
+        self.queries = []
+
+    def freebusy(self):
+        return self
+
+    def query(self, body):
+        self.queries.append(body)
+        return self
+
+    def execute(self):
+        calendar = {'errors': self.errors} if self.errors else {'busy': self.busy}
+        return {'calendars': {'primary': calendar}}
+
+
+@pytest.fixture(autouse=True)
+def clear_freebusy_cache():
+    freebusy.freebusy_cache.clear()
+    yield
+    freebusy.freebusy_cache.clear()
+
+
+def test_one_query_covers_recurring_series():
+    service = FakeCalendarService()
+    occurrences = expand_recurrence('2024-11-25', 'RRULE:FREQ=WEEKLY;INTERVAL=1;COUNT=3;BYDAY=MO,WE')
+
+    assert check_google_busy_conflict(service, occurrences, '17:00', '18:00') is None
+    assert len(service.queries) == 1
+    assert service.queries[0]['timeMin'] == '2024-11-25T00:00:00+01:00'
+    assert service.queries[0]['timeMax'] == '2024-12-03T00:00:00+01:00'
+
+
+def test_window_inside_cached_span_makes_no_new_call():
+    service = FakeCalendarService()
+    check_google_busy_conflict(service, ['2024-11-25', '2024-12-02', '2024-12-09'], '17:00', '18:00')
+
+    assert check_google_busy_conflict(service, ['2024-12-02'], '09:00', '10:00') is None
+    assert len(service.queries) == 1
+
+
+def test_overlapping_busy_period_is_a_conflict():
+    service = FakeCalendarService(busy=[{'start': '2024-12-02T16:30:00Z', 'end': '2024-12-02T17:30:00Z'}])
+
+    message = check_google_busy_conflict(service, ['2024-11-25', '2024-12-02'], '17:00', '18:00')
+
+    assert message == ("Your new event on 2024-12-02 overlaps with busy time in Google Calendar from "
+                       "2024-12-02 17:30 to 2024-12-02 18:30. Please reschedule this new event another time.")
+
+
+def test_calendar_errors_raise():
+    service = FakeCalendarService(errors=[{'domain': 'global', 'reason': 'notFound'}])
+
+    with pytest.raises(FreeBusyError, match='notFound'):
+        check_google_busy_conflict(service, ['2024-12-02'], '17:00', '18:00')
+
+
+def test_long_span_is_split_into_several_queries():
+    service = FakeCalendarService()
+    occurrences = expand_recurrence('2024-01-01', 'RRULE:FREQ=WEEKLY;INTERVAL=1;COUNT=52')
+
+    check_google_busy_conflict(service, occurrences, '17:00', '18:00')
+    queries = len(service.queries)
+
+    assert queries > 1
+    assert service.queries[0]['timeMin'] == '2024-01-01T00:00:00+01:00'
+    assert service.queries[-1]['timeMax'] == '2024-12-24T00:00:00+01:00'
+    assert check_google_busy_conflict(service, ['2024-06-03'], '17:00', '18:00') is None
+    assert len(service.queries) == queries
@@ -0,0 +1,19 @@
+from recurrence import expand_recurrence
+
+
+def test_weekly_with_byday():
+    occurrences = expand_recurrence('2024-11-25', 'RRULE:FREQ=WEEKLY;INTERVAL=1;COUNT=3;BYDAY=MO,WE')
+
+    assert occurrences == ['2024-11-25', '2024-11-27', '2024-12-02']
+
+
+def test_monthly_skips_months_without_the_day():
+    occurrences = expand_recurrence('2025-01-31', 'RRULE:FREQ=MONTHLY;INTERVAL=1;COUNT=3')
+
+    assert occurrences == ['2025-01-31', '2025-03-31', '2025-05-31']
+
+
+def test_interval_and_until():
+    occurrences = expand_recurrence('2024-11-25', 'RRULE:FREQ=WEEKLY;INTERVAL=2;UNTIL=20241231')
+
+    assert occurrences == ['2024-11-25', '2024-12-09', '2024-12-23']
@@ -0,0 +1,105 @@
+import json
+import os
+
+import pytest
+
+main = pytest.importorskip('main')
+
+
+@pytest.fixture
+def calendar_file(tmp_path):
+    file_path = str(tmp_path / 'database.json')
+    main.write_local_events(['2024-12-02'], 'Late call', '23:00', '23:59', file_path)
+    main.write_local_events(['2024-12-02'], 'Midnight', '00:00', '01:00', file_path)
+    main.write_local_events(['2024-12-02'], 'Café meeting', '12:00', '13:00', file_path)
+    main.write_local_events(['2024-12-03'], 'Next day', '00:00', '00:30', file_path)
+    return file_path
+
+
+def test_snapshot_is_written_next_to_the_json(calendar_file):
+    snapshot_path = main.snapshot_path_for(calendar_file)
+
+    assert snapshot_path.endswith('database.snapshot')
+    with open(snapshot_path, 'rb') as file:
+        header = main.SNAPSHOT_HEADER.unpack(file.read(main.SNAPSHOT_HEADER.size))
+        body = file.read()
+    magic, mtime_ns, size, count, titles_size, checksum = header
+    assert magic == main.SNAPSHOT_MAGIC
+    assert (mtime_ns, size) == (os.stat(calendar_file).st_mtime_ns, os.stat(calendar_file).st_size)
+    assert count == 4
+    assert titles_size == len('MidnightCafé meetingLate callNext day'.encode('utf-8'))
+    assert len(body) == count * main.SNAPSHOT_RECORD.size + titles_size
+    assert checksum == main.zlib.crc32(body)
+
+
+def test_search_finds_events_at_day_edges(calendar_file):
+    events = main.read_snapshot_events('2024-12-02', calendar_file)
+
+    assert [summary for summary, _, _ in events] == ['Midnight', 'Café meeting', 'Late call']
+    assert events[0][1] == main.datetime(2024, 12, 2, 0, 0)
+    assert events[-1][2] == main.datetime(2024, 12, 2, 23, 59)
+    assert [summary for summary, _, _ in main.read_snapshot_events('2024-12-03', calendar_file)] == ['Next day']
+    assert main.read_snapshot_events('2024-12-01', calendar_file) == []
+
+
+@pytest.mark.parametrize('start_time, end_time', [
+    ('00:15', '00:45'), ('11:00', '12:30'), ('12:10', '12:50'), ('13:10', '14:00'),
+    ('23:30', '23:45'), ('06:00', '07:00'),
+])
+def test_conflicts_match_with_and_without_snapshot(calendar_file, monkeypatch, start_time, end_time):
+    monkeypatch.setattr(main, 'USE_CALENDAR_SNAPSHOT', True)
+    with_snapshot = main.check_single_event_conflict('2024-12-02', start_time, end_time, calendar_file)
+    monkeypatch.setattr(main, 'USE_CALENDAR_SNAPSHOT', False)
+    without_snapshot = main.check_single_event_conflict('2024-12-02', start_time, end_time, calendar_file)
+
+    assert with_snapshot == without_snapshot
+
+
+def test_json_edit_regenerates_snapshot(calendar_file):
+    with open(calendar_file) as file:
+        data = json.load(file)
+    data['calendar'].append({'date': '2024-12-05', 'events': [{
+        'summary': 'Edited by hand',
+        'start': {'dateTime': '2024-12-05T10:00:00'},
+        'end': {'dateTime': '2024-12-05T11:00:00'},
+    }]})
+    with open(calendar_file, 'w') as file:
+        json.dump(data, file)
+
+    events = main.read_snapshot_events('2024-12-05', calendar_file)
+
+    assert [summary for summary, _, _ in events] == ['Edited by hand']
+
+
+@pytest.mark.parametrize('damage', [
+    lambda data: b'',
+    lambda data: data[:main.SNAPSHOT_HEADER.size - 1],
+    lambda data: data[:main.SNAPSHOT_HEADER.size + 10],
+    lambda data: data[:-2],
+    lambda data: data[:main.SNAPSHOT_HEADER.size] + b'\xff' * (len(data) - main.SNAPSHOT_HEADER.size),
+    lambda data: b'XXXXXXXX' + data[8:],
+])
+def test_damaged_snapshot_is_regenerated(calendar_file, damage):
+    snapshot_path = main.snapshot_path_for(calendar_file)
+    with open(snapshot_path, 'rb') as file:
+        data = file.read()
+    with open(snapshot_path, 'wb') as file:
+        file.write(damage(data))
+
+    events = main.read_snapshot_events('2024-12-02', calendar_file)
+
+    assert [summary for summary, _, _ in events] == ['Midnight', 'Café meeting', 'Late call']
+    with open(snapshot_path, 'rb') as file:
+        assert file.read() == data
+
+
+def test_recurring_event_writes_snapshot_once(tmp_path, monkeypatch):
+    file_path = str(tmp_path / 'database.json')
+    writes = []
+    write_calendar_snapshot = main.write_calendar_snapshot
+    monkeypatch.setattr(main, 'write_calendar_snapshot', lambda *args: writes.append(1) or write_calendar_snapshot(*args))
+
+    main.add_recurring_event_local('2024-12-02', 'Standup', '09:00', '09:15', 'RRULE:FREQ=DAILY;INTERVAL=1;COUNT=5', file_path)
+
+    assert len(writes) == 1
+    assert [summary for summary, _, _ in main.read_snapshot_events('2024-12-06', file_path)] == ['Standup']
@@ -0,0 +1,97 @@
+import types
+
+import pytest
+
+main = pytest.importorskip('main')
+
+
+class FakeStreamingClient:
+    """Streams a scripted chunk sequence per turn, like `ollama.Client.chat(..., stream=True)`."""
+
+    def __init__(self, turns):
+        self.turns = list(turns)
+        self.requests = []
+
+    def chat(self, model, messages, tools, stream):
+        self.requests.append([dict(message) for message in messages])
+        yield from self.turns.pop(0)()
+
+
+def tool_call(name, **arguments):
+    return {"message": {"content": "", "tool_calls": [{"function": {"name": name, "arguments": arguments}}]}}
+
+
+def make_agent(*functions, instructions="Be brief."):
+    return types.SimpleNamespace(model="scheduling_assistant", instructions=instructions, functions=list(functions))
+
+
+def test_tool_runs_before_stream_ends():
+    calls = []
+
+    def add_event(date: str) -> str:
+        calls.append(date)
+        return "Event added successfully."
+
+    def first_turn():
+        yield {"message": {"content": "Adding"}}
+        yield tool_call("add_event", date="2024-12-02")
+        assert calls == ["2024-12-02"]  # Dispatched before the rest of the stream is generated.
+        yield {"message": {"content": "", "done": True}}
+
+    def second_turn():
+        yield {"message": {"content": "Done."}}
+
+    client = FakeStreamingClient([first_turn, second_turn])
+    history, first_token, total = main.run_streaming(
+        make_agent(add_event), [{"role": "user", "content": "Add it"}], client=client)
+
+    assert first_token is not None
+    assert total >= first_token
+    assert history == [
+        {"role": "system", "content": "Be brief."},
+        {"role": "user", "content": "Add it"},
+        {"role": "assistant", "content": "Adding",
+         "tool_calls": [{"function": {"name": "add_event", "arguments": {"date": "2024-12-02"}}}]},
+        {"role": "tool", "tool_name": "add_event", "content": "Event added successfully."},
+        {"role": "assistant", "content": "Done.", "tool_calls": []},
+    ]
+    assert client.requests[1] == history[:4]
+
+
+def test_tool_error_becomes_tool_message():
+    def add_event(date: str) -> str:
+        return "Event added successfully."
+
+    client = FakeStreamingClient([
+        lambda: iter([tool_call("add_event", date="2024-12-02", colour="red")]),
+        lambda: iter([{"message": {"content": "Sorry."}}]),
+    ])
+    history, _, _ = main.run_streaming(make_agent(add_event), [{"role": "user", "content": "Add it"}], client=client)
+
+    assert history[3]["role"] == "tool"
+    assert history[3]["tool_name"] == "add_event"
+    assert history[3]["content"].startswith("Error: Tool add_event failed: TypeError")
+    assert history[-1]["content"] == "Sorry."
+
+
+def test_stops_after_max_turns():
+    calls = []
+
+    def add_event(date: str) -> str:
+        calls.append(date)
+        return "Event added successfully."
+
+    client = FakeStreamingClient([lambda: iter([tool_call("add_event", date="2024-12-02")])] * 5)
+    main.run_streaming(make_agent(add_event), [{"role": "user", "content": "Add it"}], max_turns=2, client=client)
+
+    assert len(calls) == 2
+    assert len(client.requests) == 2
+
+
+def test_callable_instructions_get_context_variables():
+    client = FakeStreamingClient([lambda: iter([{"message": {"content": "Hi"}}])])
+    agent = make_agent(instructions=lambda context_variables: f"User: {context_variables['name']}")
+
+    history, _, _ = main.run_streaming(agent, [], context_variables={"name": "Sam"}, client=client)
+
+    assert history[0] == {"role": "system", "content": "User: Sam"}
@@ -0,0 +1,35 @@
+import inspect
+
+import pytest
+
+main = pytest.importorskip('main')
+
+
+@pytest.mark.parametrize('func', ['calendar_add_event', 'calendar_add_recurring_event'])
+def test_compact_description_keeps_every_parameter(func):
+    func = getattr(main, func)
+
+    description = main.compact_description(func)
+
+    assert len(description) < len(func.__doc__)
+    for name in inspect.signature(func).parameters:
+        assert f"{name}: " in description
+
+
+def test_compact_description_of_calendar_add_event():
+    description = main.compact_description(main.calendar_add_event)
+
+    assert description == (
+        "Adds a single event to both a local JSON calendar file and Google Calendar, ensuring no scheduling "
+        "conflicts. Args: date: date of the event in `YYYY-MM-DD` format; title: title or summary of the event; "
+        "start_time: start time of the event in 24-hour `HH:MM` format; end_time: end time of the event in "
+        "24-hour `HH:MM` format."
+    )
+
+
+def test_compact_tool_keeps_name_and_signature():
+    tool = main.compact_tool(main.calendar_add_recurring_event)
+
+    assert tool.__name__ == 'calendar_add_recurring_event'
+    assert inspect.signature(tool) == inspect.signature(main.calendar_add_recurring_event)
+    assert tool.__doc__ == main.compact_description(main.calendar_add_recurring_event)